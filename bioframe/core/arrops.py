@@ -1,11 +1,31 @@
+import functools
 import re
 import warnings
 
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
 
-def natsort_key(s, _NS_REGEX=re.compile(r"(\d+)", re.U)):
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+_NS_REGEX = re.compile(r"(\d+)", re.U)
+
+
+@functools.lru_cache(maxsize=65536)
+def _natsort_key_cached(s):
+    return tuple([int(x) if x.isdigit() else x for x in _NS_REGEX.split(s) if x])
+
+
+def natsort_key(s, _NS_REGEX=None):
+    # Labels repeat heavily in genomic data (e.g. one per chromosome), so
+    # the regex split and tuple construction are cached per unique string.
+    if _NS_REGEX is None:
+        return _natsort_key_cached(s)
     return tuple([int(x) if x.isdigit() else x for x in _NS_REGEX.split(s) if x])
 
 
@@ -17,15 +37,38 @@ def argnatsort(array):
     array = np.asarray(array)
     if not len(array):
         return np.array([], dtype=int)
-    cols = tuple(zip(*(natsort_key(x) for x in array)))
-    return np.lexsort(cols[::-1])  # numpy's lexsort is ass-backwards
+    # Genomic label arrays repeat few distinct strings, so compute the
+    # natural-sort key once per unique label, rank the unique labels, and
+    # sort the full array by integer rank. Key elements are tagged with
+    # their type, so that labels mixing purely numeric and alphabetic names
+    # (e.g. Ensembl-style "1", ..., "22", "X", "MT") stay comparable:
+    # numeric segments sort before string segments.
+    unique_vals, inverse = np.unique(array, return_inverse=True)
+    keys = [
+        tuple((0, x) if isinstance(x, int) else (1, x) for x in natsort_key(s))
+        for s in unique_vals
+    ]
+    order_of_unique = sorted(range(len(keys)), key=keys.__getitem__)
+    rank = np.empty(len(unique_vals), dtype=np.int64)
+    rank[order_of_unique] = np.arange(len(unique_vals))
+    return np.argsort(rank[inverse], kind="stable")
 
 
-def _find_block_span(arr, val):
-    """Find the first and the last occurence + 1 of the value in the array."""
-    # it can be done via bisection, but for now BRUTE FORCE
-    block_idxs = np.where(arr == val)[0]
-    lo, hi = block_idxs[0], block_idxs[-1] + 1
+def _find_block_span(arr, val, sorted=True):
+    """
+    Find the first and the last occurence + 1 of the value in the array.
+
+    By default the array is assumed to be sorted (or at least grouped, with
+    the occurences of each value contiguous), so the span is located with
+    two O(log N) bisections. Pass sorted=False to fall back to a full scan
+    when the caller cannot guarantee this.
+    """
+    if sorted:
+        lo = np.searchsorted(arr, val, "left")
+        hi = np.searchsorted(arr, val, "right")
+    else:
+        block_idxs = np.where(arr == val)[0]
+        lo, hi = block_idxs[0], block_idxs[-1] + 1
     return lo, hi
 
 
@@ -75,6 +118,26 @@ def sum_slices(arr, starts, ends):
     return sums
 
 
+if HAS_NUMBA:
+
+    @njit(cache=True, parallel=True)
+    def _arange_multi_nb(starts, lengths, out_len):
+        """
+        Write the concatenated ranges in a single pass over the output,
+        parallelized over the individual ranges.
+        """
+        offsets = np.empty(len(starts) + 1, dtype=np.int64)
+        offsets[0] = 0
+        offsets[1:] = np.cumsum(lengths)
+        out = np.empty(out_len, dtype=np.int64)
+        for g in prange(len(starts)):
+            s = starts[g]
+            o = offsets[g]
+            for j in range(lengths[g]):
+                out[o + j] = s + j
+        return out
+
+
 def arange_multi(starts, stops=None, lengths=None):
     """
     Create concatenated ranges of integers for multiple start/length.
@@ -116,6 +179,21 @@ def arange_multi(starts, stops=None, lengths=None):
     if np.isscalar(starts):
         starts = np.full(len(stops), starts)
 
+    starts = np.asarray(starts)
+    lengths = np.asarray(lengths)
+
+    if (
+        HAS_NUMBA
+        and starts.dtype.kind == "i"
+        and lengths.dtype.kind == "i"
+        and (len(lengths) == 0 or lengths.min() >= 0)
+    ):
+        return _arange_multi_nb(
+            np.ascontiguousarray(starts, dtype=np.int64),
+            np.ascontiguousarray(lengths, dtype=np.int64),
+            int(lengths.sum()),
+        )
+
     # Repeat start position index length times and concatenate
     cat_start = np.repeat(starts, lengths)
 
@@ -130,6 +208,30 @@ def arange_multi(starts, stops=None, lengths=None):
     return cat_range
 
 
+def _idx_dtype(n):
+    """
+    The smallest index dtype able to address n elements. Index and id
+    arrays dominate the memory traffic of the sorts and gathers here, so
+    halving their width roughly halves the bandwidth of those steps.
+    """
+    return np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+
+def _to_np(*vecs):
+    """
+    Convert input vectors to numpy arrays, warning once if any of them is a
+    pandas.Series, whose index would be ignored.
+    """
+    if any(isinstance(vec, pd.Series) for vec in vecs):
+        warnings.warn(
+            "One of the inputs is provided as pandas.Series and its index "
+            "will be ignored.",
+            SyntaxWarning,
+            stacklevel=3,
+        )
+    return tuple(np.asarray(vec) for vec in vecs)
+
+
 def _check_overlap(starts1, ends1, starts2, ends2, closed=False):
     """
     Take pairs of intervals and test if each pair has an overlap.
@@ -204,65 +306,311 @@ def _overlap_intervals_legacy(starts1, ends1, starts2, ends2, closed=False, sort
 
     """
 
-    for vec in [starts1, ends1, starts2, ends2]:
-        if isinstance(vec, pd.Series):
-            warnings.warn(
-                "One of the inputs is provided as pandas.Series and its index "
-                "will be ignored.",
-                SyntaxWarning,
-            )
-
-    starts1 = np.asarray(starts1)
-    ends1 = np.asarray(ends1)
-    starts2 = np.asarray(starts2)
-    ends2 = np.asarray(ends2)
+    starts1, ends1, starts2, ends2 = _to_np(starts1, ends1, starts2, ends2)
 
-    # Concatenate intervals lists
+    # Concatenate intervals lists into preallocated buffers
     n1 = len(starts1)
     n2 = len(starts2)
-    starts = np.concatenate([starts1, starts2])
-    ends = np.concatenate([ends1, ends2])
+    n = n1 + n2
+    coord_dtype = np.result_type(starts1, ends1, starts2, ends2)
+    starts = np.empty(n, dtype=coord_dtype)
+    starts[:n1] = starts1
+    starts[n1:] = starts2
+    ends = np.empty(n, dtype=coord_dtype)
+    ends[:n1] = ends1
+    ends[n1:] = ends2
 
     # Encode interval ids as 1-based,
     # negative ids for the 1st set, positive ids for 2nd set
-    ids = np.concatenate([-np.arange(1, n1 + 1), np.arange(1, n2 + 1)])
-
-    # Sort all intervals together
-    order = np.lexsort([ends, starts])
+    ids = np.empty(n, dtype=_idx_dtype(n + 1))
+    ids[:n1] = np.arange(-1, -n1 - 1, -1)
+    ids[n1:] = np.arange(1, n2 + 1)
+
+    # Sort all intervals together. The downstream searchsorted only depends
+    # on the order of starts, so a single-key stable sort suffices unless
+    # zero-length intervals are present: those must sort before intervals
+    # starting at the same position, which requires ends as a second key.
+    if np.any(starts == ends):
+        order = np.lexsort([ends, starts])
+    else:
+        order = np.argsort(starts, kind="stable")
     starts, ends, ids = starts[order], ends[order], ids[order]
 
     # Find interval overlaps
-    match_starts = np.arange(0, n1 + n2)
+    match_starts = np.arange(0, n1 + n2, dtype=_idx_dtype(n + 1))
     match_ends = np.searchsorted(starts, ends, "right" if closed else "left")
 
     # Ignore self-overlaps
     match_mask = match_ends > match_starts + 1
     match_starts, match_ends = match_starts[match_mask], match_ends[match_mask]
 
+    # The candidate list pairs every interval with all later-starting
+    # intervals of the concatenated set, including the same-set pairs that
+    # are filtered out afterwards, so on dense data it can vastly exceed
+    # the output. When it does, switch to a sweep-line over position-sorted
+    # events that emits only the cross-set pairs directly. The sweep
+    # requires strictly positive interval lengths, so zero-length intervals
+    # keep the numpy path.
+    n_candidates = int(np.sum(match_ends - match_starts - 1))
+    if (
+        HAS_NUMBA
+        and n_candidates > 8 * max(n, 1 << 14)
+        and _sweep_applicable(starts1, ends1)
+        and _sweep_applicable(starts2, ends2)
+        and np.all(ends1 > starts1)
+        and np.all(ends2 > starts2)
+    ):
+        overlap_ids = _sweep_overlap(
+            np.ascontiguousarray(starts1, dtype=np.int64),
+            np.ascontiguousarray(ends1, dtype=np.int64),
+            np.ascontiguousarray(starts2, dtype=np.int64),
+            np.ascontiguousarray(ends2, dtype=np.int64),
+            closed,
+        )
+        if sort:
+            overlap_ids = _sort_overlap_ids(overlap_ids, n1)
+        return overlap_ids
+
     # Restore
-    overlap_ids = np.vstack(
-        [
-            np.repeat(ids[match_starts], match_ends - match_starts - 1),
-            ids[arange_multi(match_starts + 1, match_ends)],
-        ]
-    ).T
+    ids1_matched = np.repeat(ids[match_starts], match_ends - match_starts - 1)
+    ids2_matched = ids[arange_multi(match_starts + 1, match_ends)]
+    overlap_ids = np.empty((len(ids1_matched), 2), dtype=ids.dtype)
+    overlap_ids[:, 0] = ids1_matched
+    overlap_ids[:, 1] = ids2_matched
 
-    # Drop same-set overlaps
-    overlap_ids = overlap_ids[overlap_ids[:, 0] * overlap_ids[:, 1] <= 0]
+    # Drop same-set overlaps. Set 1 ids are negative and set 2 ids are
+    # positive by construction, so a pair is cross-set exactly when the
+    # sign bits differ - an overflow-free XOR instead of a multiplication.
+    overlap_ids = overlap_ids[(overlap_ids[:, 0] ^ overlap_ids[:, 1]) < 0]
 
     # Flip overlaps, such that the 1st column contains ids from the 1st set,
     # the 2nd column contains ids from the 2nd set.
     overlap_ids.sort(axis=-1)
 
-    # Restore original indexes,
-    overlap_ids[:, 0] = overlap_ids[:, 0] * (-1) - 1
-    overlap_ids[:, 1] = overlap_ids[:, 1] - 1
+    # Restore original indexes, operating in place to avoid temporaries
+    np.negative(overlap_ids[:, 0], out=overlap_ids[:, 0])
+    overlap_ids[:, 0] -= 1
+    overlap_ids[:, 1] -= 1
 
     # Sort overlaps according to the 1st
     if sort:
-        overlap_ids = overlap_ids[np.lexsort([overlap_ids[:, 1], overlap_ids[:, 0]])]
+        overlap_ids = _sort_overlap_ids(overlap_ids, n1)
+
+    # The id arrays are int32 internally when the interval counts permit;
+    # return a fixed dtype so callers do not see it vary with input size,
+    # numba availability or the sort flag.
+    return overlap_ids.astype(np.int64, copy=False)
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _sweep_overlap(starts1, ends1, starts2, ends2, closed):
+        """
+        Find overlapping pairs between two sets of intervals with a sweep-line
+        over position-sorted events.
+
+        All intervals must have strictly positive lengths (ends > starts);
+        the dispatch in :func:`_overlap_intervals_legacy` enforces this.
+
+        Events are packed into int64 keys as (position * 4 + priority), so a
+        single-key argsort orders them by position and, within a position, by
+        event priority. For half-open intervals ends are processed before
+        starts, so touching intervals do not overlap; for closed intervals
+        starts are processed before ends, so single-point overlaps are
+        reported.
+
+        Only cross-set pairs are emitted, so no same-set filtering or
+        quadratic candidate list is needed downstream.
+        """
+        n1 = starts1.shape[0]
+        n2 = starts2.shape[0]
+        n_ev = 2 * (n1 + n2)
+
+        ev_key = np.empty(n_ev, dtype=np.int64)
+        ev_id = np.empty(n_ev, dtype=np.int64)
+        ev_set = np.empty(n_ev, dtype=np.int8)
+        ev_kind = np.empty(n_ev, dtype=np.int8)
+
+        # Event kinds: 0 - end, 1 - start. Same-position priorities: closed
+        # intervals add starts before removing ends, open intervals remove
+        # ends first.
+        if closed:
+            prio_end, prio_start = 1, 0
+        else:
+            prio_end, prio_start = 0, 1
+
+        e = 0
+        for side in range(2):
+            if side == 0:
+                starts, ends = starts1, ends1
+            else:
+                starts, ends = starts2, ends2
+            for i in range(starts.shape[0]):
+                ev_key[e] = starts[i] * 4 + prio_start
+                ev_id[e] = i
+                ev_set[e] = side
+                ev_kind[e] = 1
+                e += 1
+                ev_key[e] = ends[i] * 4 + prio_end
+                ev_id[e] = i
+                ev_set[e] = side
+                ev_kind[e] = 0
+                e += 1
+
+        order = np.argsort(ev_key, kind="mergesort")
+
+        # Active sets with O(1) swap-removal via position lookups.
+        active1 = np.empty(n1, dtype=np.int64)
+        active2 = np.empty(n2, dtype=np.int64)
+        pos1 = np.full(n1, -1, dtype=np.int64)
+        pos2 = np.full(n2, -1, dtype=np.int64)
+        n_active1 = 0
+        n_active2 = 0
+
+        cap = 64
+        out1 = np.empty(cap, dtype=np.int64)
+        out2 = np.empty(cap, dtype=np.int64)
+        n_out = 0
+
+        for k in range(n_ev):
+            e = order[k]
+            i = ev_id[e]
+            side = ev_set[e]
+            kind = ev_kind[e]
+
+            if kind == 0:  # end: swap-remove from the active set
+                if side == 0:
+                    p = pos1[i]
+                    if p >= 0:
+                        last = active1[n_active1 - 1]
+                        active1[p] = last
+                        pos1[last] = p
+                        n_active1 -= 1
+                        pos1[i] = -1
+                else:
+                    p = pos2[i]
+                    if p >= 0:
+                        last = active2[n_active2 - 1]
+                        active2[p] = last
+                        pos2[last] = p
+                        n_active2 -= 1
+                        pos2[i] = -1
+            else:  # start: pair with the other active set, then join
+                if side == 0:
+                    n_other = n_active2
+                else:
+                    n_other = n_active1
+                if n_out + n_other > cap:
+                    while n_out + n_other > cap:
+                        cap *= 2
+                    new_out1 = np.empty(cap, dtype=np.int64)
+                    new_out2 = np.empty(cap, dtype=np.int64)
+                    new_out1[:n_out] = out1[:n_out]
+                    new_out2[:n_out] = out2[:n_out]
+                    out1 = new_out1
+                    out2 = new_out2
+                if side == 0:
+                    for j in range(n_active2):
+                        out1[n_out] = i
+                        out2[n_out] = active2[j]
+                        n_out += 1
+                else:
+                    for j in range(n_active1):
+                        out1[n_out] = active1[j]
+                        out2[n_out] = i
+                        n_out += 1
+                if side == 0:
+                    active1[n_active1] = i
+                    pos1[i] = n_active1
+                    n_active1 += 1
+                else:
+                    active2[n_active2] = i
+                    pos2[i] = n_active2
+                    n_active2 += 1
+
+        overlap_ids = np.empty((n_out, 2), dtype=np.int64)
+        overlap_ids[:, 0] = out1[:n_out]
+        overlap_ids[:, 1] = out2[:n_out]
+        return overlap_ids
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _sort_pairs_nb(pairs, n1):
+        """
+        Sort an (N, 2) array of id pairs by the first column with a stable
+        counting sort (first-column values lie in [0, n1)), then order each
+        bucket by the second column.
+        """
+        n_pairs = pairs.shape[0]
+        counts = np.zeros(n1 + 1, dtype=np.int64)
+        for r in range(n_pairs):
+            counts[pairs[r, 0] + 1] += 1
+        offsets = np.cumsum(counts)
+
+        out = np.empty_like(pairs)
+        pos = offsets[:n1].copy()
+        for r in range(n_pairs):
+            b = pairs[r, 0]
+            out[pos[b], 0] = b
+            out[pos[b], 1] = pairs[r, 1]
+            pos[b] += 1
+
+        for i in range(n1):
+            lo = offsets[i]
+            hi = offsets[i + 1]
+            if hi - lo > 1:
+                out[lo:hi, 1] = np.sort(out[lo:hi, 1])
+
+        return out
+
+
+def _sort_overlap_ids(overlap_ids, n1):
+    """
+    Sort an (N, 2) array of overlap ids by the first column, then by the
+    second. Uses an O(N + n1) counting sort over the first column when
+    numba is available, np.lexsort otherwise.
+    """
+    if HAS_NUMBA and overlap_ids.shape[0] > 0:
+        return _sort_pairs_nb(
+            np.ascontiguousarray(overlap_ids, dtype=np.int64), n1
+        )
+    return overlap_ids[np.lexsort([overlap_ids[:, 1], overlap_ids[:, 0]])]
+
+
+def _as_interval_array(starts, ends):
+    """
+    Pack starts and ends into a structured (start, end) array, so that
+    paired coordinates sort and gather together in a single pass instead of
+    being reordered field by field.
+    """
+    coord_dtype = np.result_type(starts, ends)
+    intervals = np.empty(
+        len(starts), dtype=[("start", coord_dtype), ("end", coord_dtype)]
+    )
+    intervals["start"] = starts
+    intervals["end"] = ends
+    return intervals
 
-    return overlap_ids
+
+def _sweep_applicable(starts, ends):
+    """
+    Check that interval coordinates are well-formed integers that fit into
+    the packed (position * 4 + priority) sweep-line event keys without
+    overflowing int64.
+    """
+    if starts.dtype.kind != "i" or ends.dtype.kind != "i":
+        return False
+    if len(starts) == 0:
+        return True
+    coord_max = np.int64(1) << 61
+    return (
+        starts.min() > -coord_max
+        and ends.max() < coord_max
+        and (ends >= starts).all()
+    )
 
 
 def overlap_intervals(starts1, ends1, starts2, ends2, closed=False, sort=False):
@@ -286,30 +634,24 @@ def overlap_intervals(starts1, ends1, starts2, ends2, closed=False, sort=False):
 
     """
 
-    for vec in [starts1, ends1, starts2, ends2]:
-        if isinstance(vec, pd.Series):
-            warnings.warn(
-                "One of the inputs is provided as pandas.Series and its index "
-                "will be ignored.",
-                SyntaxWarning,
-            )
-
-    starts1 = np.asarray(starts1)
-    ends1 = np.asarray(ends1)
-    starts2 = np.asarray(starts2)
-    ends2 = np.asarray(ends2)
+    starts1, ends1, starts2, ends2 = _to_np(starts1, ends1, starts2, ends2)
 
     # Concatenate intervals lists
     n1 = len(starts1)
     n2 = len(starts2)
-    ids1 = np.arange(0, n1)
-    ids2 = np.arange(0, n2)
-
-    # Sort all intervals together
-    order1 = np.lexsort([ends1, starts1])
-    order2 = np.lexsort([ends2, starts2])
-    starts1, ends1, ids1 = starts1[order1], ends1[order1], ids1[order1]
-    starts2, ends2, ids2 = starts2[order2], ends2[order2], ids2[order2]
+    ids1 = np.arange(0, n1, dtype=_idx_dtype(n1))
+    ids2 = np.arange(0, n2, dtype=_idx_dtype(n2))
+
+    # Sort all intervals together. Sorting the structured arrays orders by
+    # (start, end) and moves each start/end pair in one gather.
+    intervals1 = _as_interval_array(starts1, ends1)
+    intervals2 = _as_interval_array(starts2, ends2)
+    order1 = np.argsort(intervals1, kind="stable")
+    order2 = np.argsort(intervals2, kind="stable")
+    intervals1, ids1 = intervals1[order1], ids1[order1]
+    intervals2, ids2 = intervals2[order2], ids2[order2]
+    starts1, ends1 = intervals1["start"], intervals1["end"]
+    starts2, ends2 = intervals2["start"], intervals2["end"]
 
     # Find interval overlaps
     match_2in1_starts = np.searchsorted(starts2, starts1, "left")
@@ -350,9 +692,12 @@ def overlap_intervals(starts1, ends1, starts2, ends2, closed=False, sort=False):
 
     if sort:
         # Sort overlaps according to the 1st
-        overlap_ids = overlap_ids[np.lexsort([overlap_ids[:, 1], overlap_ids[:, 0]])]
+        overlap_ids = _sort_overlap_ids(overlap_ids, n1)
 
-    return overlap_ids
+    # The id arrays are int32 internally when the interval counts permit;
+    # return a fixed dtype so callers do not see it vary with input size
+    # or the sort flag.
+    return overlap_ids.astype(np.int64, copy=False)
 
 
 def overlap_intervals_outer(starts1, ends1, starts2, ends2, closed=False):
@@ -392,6 +737,248 @@ def overlap_intervals_outer(starts1, ends1, starts2, ends2, closed=False):
     return ovids, no_overlap_ids1, no_overlap_ids2
 
 
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _cluster_ids_from_gaps_nb(gap):
+        """
+        Accumulate cluster ids from the inter-interval gap mask in a single
+        pass, reading one byte per element and writing the ids directly.
+        """
+        out = np.empty(len(gap) + 1, dtype=np.int64)
+        c = 0
+        out[0] = 0
+        for i in range(len(gap)):
+            if gap[i]:
+                c += 1
+            out[i + 1] = c
+        return out
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _nclist_parents_nb(starts, ends):
+        parents = np.full(len(starts), -1, dtype=np.int64)
+        stack = np.empty(len(starts), dtype=np.int64)
+        depth = 0
+        for i in range(len(starts)):
+            while depth > 0 and ends[i] > ends[stack[depth - 1]]:
+                depth -= 1
+            if depth > 0:
+                parents[i] = stack[depth - 1]
+            stack[depth] = i
+            depth += 1
+        return parents
+
+    @njit(cache=True)
+    def _nclist_query_nb(
+        starts, ends, child_offsets, children, ids, q_starts, q_ends, closed
+    ):
+        cap = 64
+        out_q = np.empty(cap, dtype=np.int64)
+        out_i = np.empty(cap, dtype=np.int64)
+        n_out = 0
+
+        stack_cap = 64
+        stack_lo = np.empty(stack_cap, dtype=np.int64)
+        stack_hi = np.empty(stack_cap, dtype=np.int64)
+
+        for q in range(len(q_starts)):
+            qs = q_starts[q]
+            qe = q_ends[q]
+
+            # Start from the children of the virtual root (bucket 0).
+            depth = 0
+            stack_lo[0] = child_offsets[0]
+            stack_hi[0] = child_offsets[1]
+            depth = 1
+
+            while depth > 0:
+                depth -= 1
+                lo = stack_lo[depth]
+                hi = stack_hi[depth]
+
+                # Sibling lists are sorted by both start and end; bisect to
+                # the first sibling whose end reaches the query.
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    e = ends[children[mid]]
+                    if (e > qs) or (closed and e == qs):
+                        hi = mid
+                    else:
+                        lo = mid + 1
+
+                pos = lo
+                hi = stack_hi[depth]
+                while pos < hi:
+                    node = children[pos]
+                    s = starts[node]
+                    if s > qe or (s == qe and not closed):
+                        break
+                    if n_out == cap:
+                        cap *= 2
+                        new_q = np.empty(cap, dtype=np.int64)
+                        new_i = np.empty(cap, dtype=np.int64)
+                        new_q[:n_out] = out_q
+                        new_i[:n_out] = out_i
+                        out_q = new_q
+                        out_i = new_i
+                    out_q[n_out] = q
+                    out_i[n_out] = ids[node]
+                    n_out += 1
+                    if depth == stack_cap:
+                        stack_cap *= 2
+                        new_lo = np.empty(stack_cap, dtype=np.int64)
+                        new_hi = np.empty(stack_cap, dtype=np.int64)
+                        new_lo[:depth] = stack_lo
+                        new_hi[:depth] = stack_hi
+                        stack_lo = new_lo
+                        stack_hi = new_hi
+                    stack_lo[depth] = child_offsets[node + 1]
+                    stack_hi[depth] = child_offsets[node + 2]
+                    depth += 1
+                    pos += 1
+
+        out = np.empty((n_out, 2), dtype=np.int64)
+        out[:, 0] = out_q[:n_out]
+        out[:, 1] = out_i[:n_out]
+        return out
+
+
+class IntervalIndex:
+    """
+    A Nested Containment List index over a set of intervals, for repeated
+    overlap queries against the same set.
+
+    Intervals are sorted by (start, -end) once at construction; intervals
+    contained in another interval are attached to it as children, so every
+    sibling list is sorted by both start and end and can be bisected during
+    queries. Building is O(n log n) and querying is O(log n + m) per query
+    interval with m hits, which amortizes the per-call sorting done by
+    :func:`overlap_intervals` when one set is queried many times.
+
+    Parameters
+    ----------
+    starts, ends : numpy.ndarray
+        Coordinates of the indexed intervals. Must be of an integer dtype.
+
+    Notes
+    -----
+    Queries report the same pairs as :func:`overlap_intervals` for non-empty
+    intervals. Zero-length intervals match where they are strictly inside a
+    partner (or touch it, with closed=True), without the asymmetric
+    treatment of zero-length set 2 intervals by overlap_intervals.
+    """
+
+    def __init__(self, starts, ends):
+        starts, ends = _to_np(starts, ends)
+        if starts.dtype.kind != "i" or ends.dtype.kind != "i":
+            raise ValueError("IntervalIndex requires integer coordinates.")
+
+        n = len(starts)
+        order = np.lexsort([-ends, starts])
+        self._starts = np.ascontiguousarray(starts[order], dtype=np.int64)
+        self._ends = np.ascontiguousarray(ends[order], dtype=np.int64)
+        self._ids = np.ascontiguousarray(order, dtype=np.int64)
+
+        if HAS_NUMBA:
+            parents = _nclist_parents_nb(self._starts, self._ends)
+        else:
+            parents = np.full(n, -1, dtype=np.int64)
+            stack = []
+            for i in range(n):
+                while stack and self._ends[i] > self._ends[stack[-1]]:
+                    stack.pop()
+                if stack:
+                    parents[i] = stack[-1]
+                stack.append(i)
+
+        # Group children by parent; bucket 0 belongs to the virtual root.
+        counts = np.bincount(parents + 1, minlength=n + 1)
+        self._child_offsets = np.zeros(n + 2, dtype=np.int64)
+        np.cumsum(counts, out=self._child_offsets[1:])
+        self._children = np.ascontiguousarray(
+            np.argsort(parents, kind="stable"), dtype=np.int64
+        )
+
+    def query(self, starts, ends, closed=False, sort=False):
+        """
+        Return the indices of pairs of overlapping intervals between the
+        query intervals and the indexed set.
+
+        Parameters
+        ----------
+        starts, ends : numpy.ndarray
+            Coordinates of the query intervals. Must be of an integer
+            dtype.
+
+        closed : bool
+            If True, then treat intervals as closed and report single-point
+            overlaps.
+
+        sort : bool
+            If True, sort the output by query id, then by indexed id.
+
+        Returns
+        -------
+        overlap_ids : numpy.ndarray
+            An Nx2 array of pairs of indices; the 1st column contains query
+            interval ids, the 2nd column contains ids of the overlapping
+            indexed intervals.
+        """
+        starts, ends = _to_np(starts, ends)
+        if starts.dtype.kind != "i" or ends.dtype.kind != "i":
+            raise ValueError("IntervalIndex requires integer coordinates.")
+        q_starts = np.ascontiguousarray(starts, dtype=np.int64)
+        q_ends = np.ascontiguousarray(ends, dtype=np.int64)
+
+        if HAS_NUMBA:
+            overlap_ids = _nclist_query_nb(
+                self._starts,
+                self._ends,
+                self._child_offsets,
+                self._children,
+                self._ids,
+                q_starts,
+                q_ends,
+                closed,
+            )
+        else:
+            out_q, out_i = [], []
+            for q in range(len(q_starts)):
+                qs, qe = q_starts[q], q_ends[q]
+                stack = [(self._child_offsets[0], self._child_offsets[1])]
+                while stack:
+                    lo, hi = stack.pop()
+                    sub_ends = self._ends[self._children[lo:hi]]
+                    pos = lo + np.searchsorted(
+                        sub_ends, qs, "left" if closed else "right"
+                    )
+                    while pos < hi:
+                        node = self._children[pos]
+                        s = self._starts[node]
+                        if s > qe or (s == qe and not closed):
+                            break
+                        out_q.append(q)
+                        out_i.append(self._ids[node])
+                        stack.append(
+                            (
+                                self._child_offsets[node + 1],
+                                self._child_offsets[node + 2],
+                            )
+                        )
+                        pos += 1
+            overlap_ids = np.empty((len(out_q), 2), dtype=np.int64)
+            overlap_ids[:, 0] = out_q
+            overlap_ids[:, 1] = out_i
+
+        if sort:
+            overlap_ids = _sort_overlap_ids(overlap_ids, len(q_starts))
+
+        return overlap_ids
+
+
 def merge_intervals(starts, ends, min_dist=0):
     """
     Merge overlapping intervals.
@@ -424,38 +1011,48 @@ def merge_intervals(starts, ends, min_dist=0):
     https://stackoverflow.com/questions/43600878/merging-overlapping-intervals/58976449#58976449
     """
 
-    for vec in [starts, ends]:
-        if isinstance(vec, pd.Series):
-            warnings.warn(
-                "One of the inputs is provided as pandas.Series and its index "
-                "will be ignored.",
-                SyntaxWarning,
-            )
-
-    starts = np.asarray(starts)
-    ends = np.asarray(ends)
-
-    order = np.lexsort([ends, starts])
-    starts, ends = starts[order], ends[order]
+    starts, ends = _to_np(starts, ends)
 
-    ends = np.maximum.accumulate(ends)
-    cluster_borders = np.zeros(len(starts) + 1, dtype=bool)
-    cluster_borders[0] = True
-    cluster_borders[-1] = True
+    n = starts.shape[0]
+    if n == 0:
+        return np.full(0, -1), starts.copy(), ends.copy()
+
+    # For non-negative min_dist, a single-key stable sort is sufficient:
+    # the strict gap test below cannot split ties on starts, so the
+    # cumulative maximum of ends does not depend on the order within them.
+    # With min_dist=None or min_dist < 0 the gap test can separate
+    # intervals starting at the same position, so the order of ends within
+    # ties matters and the two-key sort is kept.
+    if min_dist is not None and min_dist >= 0:
+        order = np.argsort(starts, kind="stable")
+    else:
+        order = np.lexsort([ends, starts])
+    starts_sorted = starts[order]
+    ends_sorted = np.maximum.accumulate(ends[order])
 
+    # Mark the gaps between consecutive clusters.
     if min_dist is not None:
-        cluster_borders[1:-1] = starts[1:] > ends[:-1] + min_dist
+        gap = starts_sorted[1:] > ends_sorted[:-1] + min_dist
     else:
-        cluster_borders[1:-1] = starts[1:] >= ends[:-1]
+        gap = starts_sorted[1:] >= ends_sorted[:-1]
+
+    border_pos = np.nonzero(gap)[0]
 
-    cluster_ids_sorted = np.cumsum(cluster_borders)[:-1] - 1
-    cluster_ids = np.full(starts.shape[0], -1)
+    if HAS_NUMBA:
+        cluster_ids_sorted = _cluster_ids_from_gaps_nb(gap)
+    else:
+        cluster_ids_sorted = np.empty(n, dtype=np.int64)
+        cluster_ids_sorted[0] = 0
+        np.cumsum(gap, dtype=np.int64, out=cluster_ids_sorted[1:])
+    cluster_ids = np.full(n, -1, dtype=_idx_dtype(n))
     cluster_ids[order] = cluster_ids_sorted
 
-    cluster_starts = starts[:][cluster_borders[:-1]]
-    cluster_ends = ends[:][cluster_borders[1:]]
+    cluster_starts = starts_sorted[np.concatenate(([0], border_pos + 1))]
+    cluster_ends = ends_sorted[np.concatenate((border_pos, [n - 1]))]
 
-    return cluster_ids, cluster_starts, cluster_ends
+    # The cluster ids are int32 internally when the interval count permits;
+    # return a fixed dtype so callers do not see it vary with input size.
+    return cluster_ids.astype(np.int64, copy=False), cluster_starts, cluster_ends
 
 
 def complement_intervals(
@@ -471,15 +1068,105 @@ def complement_intervals(
     merged_starts = merged_starts[lo:hi]
     merged_ends = merged_ends[lo:hi]
 
-    # Trim the complement to the bounds.
-    complement_starts = np.r_[bounds[0], merged_ends]
-    complement_ends = np.r_[merged_starts, bounds[1]]
-    lo = 1 if (complement_starts[0] >= complement_ends[0]) else 0
-    hi = -1 if (complement_starts[-1] >= complement_ends[-1]) else None
-    complement_starts = complement_starts[lo:hi]
-    complement_ends = complement_ends[lo:hi]
+    # Trim the complement to the bounds. Only the flanking entries can be
+    # empty, so masking out empty intervals is equivalent to trimming them.
+    n_merged = len(merged_starts)
+    coord_dtype = np.result_type(merged_starts, merged_ends, np.asarray(bounds))
+    complement_starts = np.empty(n_merged + 1, dtype=coord_dtype)
+    complement_starts[0] = bounds[0]
+    complement_starts[1:] = merged_ends
+    complement_ends = np.empty(n_merged + 1, dtype=coord_dtype)
+    complement_ends[:n_merged] = merged_starts
+    complement_ends[n_merged] = bounds[1]
+    valid = complement_starts < complement_ends
+
+    return complement_starts[valid], complement_ends[valid]
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _merge_searchsorted_nb(a, v, right):
+        """
+        Insertion indices of sorted queries v into sorted a by a linear
+        merge: one sequential pass over both arrays instead of a binary
+        search per query.
+        """
+        out = np.empty(len(v), dtype=np.int64)
+        n = len(a)
+        j = 0
+        for i in range(len(v)):
+            x = v[i]
+            if right:
+                while j < n and a[j] <= x:
+                    j += 1
+            else:
+                while j < n and a[j] < x:
+                    j += 1
+            out[i] = j
+        return out
+
+
+def _searchsorted_if_sorted(a, v, side="left"):
+    """
+    np.searchsorted(a, v, side=side) that switches to an O(len(a) + len(v))
+    sequential merge when the queries v are themselves sorted (detected with
+    a cheap monotonicity check) and numerous enough for the merge to beat
+    the len(v) * log(len(a)) cost of per-query bisection - with few queries
+    against a large reference the linear pass over a would dominate.
+    a must be sorted, as for np.searchsorted.
+    """
+    if (
+        HAS_NUMBA
+        and len(v) > 0
+        and a.dtype.kind == "i"
+        and v.dtype.kind == "i"
+        and len(v) * max(len(a).bit_length() - 1, 1) > len(a) + len(v)
+        and np.all(v[1:] >= v[:-1])
+    ):
+        return _merge_searchsorted_nb(
+            np.ascontiguousarray(a, dtype=np.int64),
+            np.ascontiguousarray(v, dtype=np.int64),
+            side == "right",
+        )
+    return np.searchsorted(a, v, side)
+
+
+def _argsort_tiebreak(primary, tie, tie_ascending=True):
+    """
+    Stable argsort by primary values, breaking ties by the tie values.
+
+    When both arrays are integers and their ranges permit, the two keys are
+    packed into a single int64 (primary in the high bits, the rebased tie
+    values in the low bits) and sorted with one single-key argsort instead
+    of the multi-pass np.lexsort. Falls back to np.lexsort when the values
+    are not integers or the packed key would overflow.
+    """
+    primary = np.asarray(primary)
+    tie = np.asarray(tie)
+
+    if len(primary) == 0:
+        return np.argsort(primary)
+
+    if primary.dtype.kind == "i" and tie.dtype.kind == "i":
+        tie_min = int(tie.min())
+        tie_max = int(tie.max())
+        if tie_ascending:
+            tie_rebased = tie.astype(np.int64) - tie_min
+        else:
+            tie_rebased = tie_max - tie.astype(np.int64)
+        tie_bits = int(tie_max - tie_min).bit_length()
+        primary_bits = max(
+            int(primary.max()).bit_length(), int(primary.min()).bit_length()
+        )
+        if primary_bits + tie_bits < 62:
+            key = (primary.astype(np.int64) << tie_bits) | tie_rebased
+            return np.argsort(key, kind="stable")
 
-    return complement_starts, complement_ends
+    if tie_ascending:
+        return np.lexsort([tie, primary])
+    else:
+        return np.lexsort([-tie, primary])
 
 
 def _closest_intervals_nooverlap(
@@ -518,18 +1205,7 @@ def _closest_intervals_nooverlap(
 
     """
 
-    for vec in [starts1, ends1, starts2, ends2]:
-        if isinstance(vec, pd.Series):
-            warnings.warn(
-                "One of the inputs is provided as pandas.Series "
-                "and its index will be ignored.",
-                SyntaxWarning,
-            )
-
-    starts1 = np.asarray(starts1)
-    ends1 = np.asarray(ends1)
-    starts2 = np.asarray(starts2)
-    ends2 = np.asarray(ends2)
+    starts1, ends1, starts2, ends2 = _to_np(starts1, ends1, starts2, ends2)
 
     n1 = starts1.shape[0]
     n2 = starts2.shape[0]
@@ -540,55 +1216,228 @@ def _closest_intervals_nooverlap(
         if tie_arr is None:
             ends2_sort_order = np.argsort(ends2)
         else:
-            ends2_sort_order = np.lexsort([-tie_arr, ends2])
+            ends2_sort_order = _argsort_tiebreak(ends2, tie_arr, tie_ascending=False)
 
-        ids2_endsorted = np.arange(0, n2)[ends2_sort_order]
+        ids2_endsorted = np.arange(0, n2, dtype=_idx_dtype(n2))[ends2_sort_order]
         ends2_sorted = ends2[ends2_sort_order]
 
-        left_closest_endidx = np.searchsorted(ends2_sorted, starts1, "right")
+        left_closest_endidx = _searchsorted_if_sorted(ends2_sorted, starts1, "right")
         left_closest_startidx = np.maximum(left_closest_endidx - k, 0)
 
-        int1_ids = np.repeat(np.arange(n1), left_closest_endidx - left_closest_startidx)
+        int1_ids = np.repeat(
+            np.arange(n1, dtype=_idx_dtype(n1)),
+            left_closest_endidx - left_closest_startidx,
+        )
         int2_sorted_ids = arange_multi(left_closest_startidx, left_closest_endidx)
 
-        ids = np.vstack(
-            [
-                int1_ids,
-                ids2_endsorted[int2_sorted_ids],
-                # ends2_sorted[int2_sorted_ids] - starts1[int1_ids],
-                # arange_multi(left_closest_startidx - left_closest_endidx, 0)
-            ]
-        ).T
+        ids = np.empty((len(int1_ids), 2), dtype=np.int64)
+        ids[:, 0] = int1_ids
+        ids[:, 1] = ids2_endsorted[int2_sorted_ids]
 
     elif k > 0 and direction == "right":
         if tie_arr is None:
             starts2_sort_order = np.argsort(starts2)
         else:
-            starts2_sort_order = np.lexsort([tie_arr, starts2])
+            starts2_sort_order = _argsort_tiebreak(starts2, tie_arr)
 
-        ids2_startsorted = np.arange(0, n2)[starts2_sort_order]
+        ids2_startsorted = np.arange(0, n2, dtype=_idx_dtype(n2))[starts2_sort_order]
         starts2_sorted = starts2[starts2_sort_order]
 
-        right_closest_startidx = np.searchsorted(starts2_sorted, ends1, "left")
+        right_closest_startidx = _searchsorted_if_sorted(starts2_sorted, ends1, "left")
         right_closest_endidx = np.minimum(right_closest_startidx + k, n2)
 
         int1_ids = np.repeat(
-            np.arange(n1), right_closest_endidx - right_closest_startidx
+            np.arange(n1, dtype=_idx_dtype(n1)),
+            right_closest_endidx - right_closest_startidx,
         )
         int2_sorted_ids = arange_multi(right_closest_startidx, right_closest_endidx)
-        ids = np.vstack(
-            [
-                int1_ids,
-                ids2_startsorted[int2_sorted_ids],
-                #  starts2_sorted[int2_sorted_ids] - ends1[int1_ids],
-                #  arange_multi(1, right_closest_endidx -
-                #                  right_closest_startidx + 1)
-            ]
-        ).T
+        ids = np.empty((len(int1_ids), 2), dtype=np.int64)
+        ids[:, 0] = int1_ids
+        ids[:, 1] = ids2_startsorted[int2_sorted_ids]
 
     return ids
 
 
+if HAS_NUMBA:
+
+    @njit(cache=True, parallel=True)
+    def _closest_topk_nb(ids1, ids2, dists, ties, n1, k):
+        """
+        For each set 1 interval, select the k candidate neighbors with the
+        smallest (distance, tie value, set 2 id), parallelized over set 1
+        intervals.
+
+        Candidates are first grouped by set 1 id with a stable counting
+        sort; each group is then reduced with a bounded insertion sort of
+        size k, so no global N log N sort of the candidate list is needed.
+        """
+        n_cand = ids1.shape[0]
+        counts = np.zeros(n1 + 1, dtype=np.int64)
+        for r in range(n_cand):
+            counts[ids1[r] + 1] += 1
+        offsets = np.cumsum(counts)
+
+        bucket_ids2 = np.empty(n_cand, dtype=np.int64)
+        bucket_dists = np.empty(n_cand, dtype=np.int64)
+        bucket_ties = np.empty(n_cand, dtype=np.int64)
+        pos = offsets[:n1].copy()
+        for r in range(n_cand):
+            b = ids1[r]
+            p = pos[b]
+            bucket_ids2[p] = ids2[r]
+            bucket_dists[p] = dists[r]
+            bucket_ties[p] = ties[r]
+            pos[b] += 1
+
+        out_counts = np.empty(n1, dtype=np.int64)
+        for i in range(n1):
+            out_counts[i] = min(k, offsets[i + 1] - offsets[i])
+        out_offsets = np.empty(n1 + 1, dtype=np.int64)
+        out_offsets[0] = 0
+        out_offsets[1:] = np.cumsum(out_counts)
+
+        out = np.empty((out_offsets[n1], 2), dtype=np.int64)
+        for i in prange(n1):
+            lo = offsets[i]
+            hi = offsets[i + 1]
+            m = out_counts[i]
+            if m == 0:
+                continue
+            best_d = np.empty(m, dtype=np.int64)
+            best_t = np.empty(m, dtype=np.int64)
+            best_v = np.empty(m, dtype=np.int64)
+            cnt = 0
+            for j in range(lo, hi):
+                d = bucket_dists[j]
+                t = bucket_ties[j]
+                v = bucket_ids2[j]
+                if cnt == m and (
+                    d > best_d[m - 1]
+                    or (
+                        d == best_d[m - 1]
+                        and (
+                            t > best_t[m - 1]
+                            or (t == best_t[m - 1] and v >= best_v[m - 1])
+                        )
+                    )
+                ):
+                    continue
+                p = min(cnt, m - 1)
+                while p > 0 and (
+                    d < best_d[p - 1]
+                    or (
+                        d == best_d[p - 1]
+                        and (
+                            t < best_t[p - 1]
+                            or (t == best_t[p - 1] and v < best_v[p - 1])
+                        )
+                    )
+                ):
+                    best_d[p] = best_d[p - 1]
+                    best_t[p] = best_t[p - 1]
+                    best_v[p] = best_v[p - 1]
+                    p -= 1
+                best_d[p] = d
+                best_t[p] = t
+                best_v[p] = v
+                if cnt < m:
+                    cnt += 1
+            o = out_offsets[i]
+            for p in range(m):
+                out[o + p, 0] = i
+                out[o + p, 1] = best_v[p]
+        return out
+
+
+def _closest_k1_fast(ids1, ids2, dists, n1, n2):
+    """
+    Vectorized k=1 selection without tie-breaking data: for each set 1
+    interval, pick the candidate with the smallest (distance, set 2 id).
+    The two keys are packed into one int64 and reduced with a single
+    np.minimum.at pass, so no sorting or grouping is needed.
+    """
+    int64_max = np.iinfo(np.int64).max
+    key = dists.astype(np.int64) * (n2 + 1) + ids2
+    best = np.full(n1, int64_max, dtype=np.int64)
+    np.minimum.at(best, ids1, key)
+    found = np.flatnonzero(best != int64_max)
+    out = np.empty((len(found), 2), dtype=np.int64)
+    out[:, 0] = found
+    out[:, 1] = best[found] % (n2 + 1)
+    return out
+
+
+def _closest_topk_np(ids1, ids2, dists, ties, n1, k):
+    """
+    For each set 1 interval, select the k candidate neighbors with the
+    smallest (distance, tie value, set 2 id), in numpy.
+
+    In the common regime of many small candidate groups - every set 1
+    interval contributes at most ~2k non-overlapping candidates - the
+    selection is fully vectorized: one global multi-key sort of the
+    candidates, then the first min(k, group size) rows of each group.
+    When the groups are large on average, candidates are instead grouped
+    with a stable argsort and each group is pre-filtered with
+    np.partition on the distances: only candidates at or below the k-th
+    smallest distance survive (ties at the boundary included, so
+    tie-breaking stays exact), and only the survivors get the full
+    multi-key sort.
+    """
+    n_cand = ids1.shape[0]
+    if n_cand == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    counts = np.bincount(ids1, minlength=n1)
+    offsets = np.empty(n1 + 1, dtype=np.int64)
+    offsets[0] = 0
+    np.cumsum(counts, out=offsets[1:])
+    n_groups = np.count_nonzero(counts)
+
+    if n_cand > max(512, 8 * k) * n_groups:
+        # Few large groups: per-group partitioning beats sorting the
+        # whole candidate list.
+        order = np.argsort(ids1, kind="stable")
+        ids2_sorted = ids2[order]
+        dists_sorted = dists[order]
+        ties_sorted = None if ties is None else ties[order]
+
+        out1 = []
+        out2 = []
+        for i in np.flatnonzero(counts):
+            lo, hi = offsets[i], offsets[i + 1]
+            cand_dists = dists_sorted[lo:hi]
+            if hi - lo > k:
+                thresh = np.partition(cand_dists, k - 1)[k - 1]
+                keep = np.flatnonzero(cand_dists <= thresh)
+            else:
+                keep = np.arange(hi - lo)
+            cand_ids2 = ids2_sorted[lo:hi][keep]
+            if ties_sorted is None:
+                keep_order = np.lexsort([cand_ids2, cand_dists[keep]])
+            else:
+                keep_order = np.lexsort(
+                    [cand_ids2, ties_sorted[lo:hi][keep], cand_dists[keep]]
+                )
+            keep_order = keep_order[:k]
+            out1.append(np.full(len(keep_order), i, dtype=np.int64))
+            out2.append(cand_ids2[keep_order])
+
+        out = np.empty((sum(len(o) for o in out1), 2), dtype=np.int64)
+        out[:, 0] = np.concatenate(out1)
+        out[:, 1] = np.concatenate(out2)
+        return out
+
+    if ties is None:
+        order = np.lexsort([ids2, dists, ids1])
+    else:
+        order = np.lexsort([ids2, ties, dists, ids1])
+    take = arange_multi(offsets[:-1], lengths=np.minimum(counts, k))
+    out = np.empty((len(take), 2), dtype=np.int64)
+    out[:, 0] = ids1[order][take]
+    out[:, 1] = ids2[order][take]
+    return out
+
+
 def closest_intervals(
     starts1,
     ends1,
@@ -704,35 +1553,65 @@ def closest_intervals(
     left_dists = starts1[left_ids[:, 0]] - ends2[left_ids[:, 1]] + 1
     right_dists = starts2[right_ids[:, 1]] - ends1[right_ids[:, 0]] + 1
 
-    closest_ids = np.vstack([left_ids, right_ids, overlap_ids])
+    left_dists = np.asarray(left_dists)
+    right_dists = np.asarray(right_dists)
+
+    closest_ids = np.concatenate([left_ids, right_ids, overlap_ids])
     closest_dists = np.concatenate(
-        [left_dists, right_dists, np.zeros(overlap_ids.shape[0])]
+        [
+            left_dists,
+            right_dists,
+            np.zeros(
+                overlap_ids.shape[0],
+                dtype=np.result_type(left_dists.dtype, right_dists.dtype, np.int64),
+            ),
+        ]
     )
 
-    # Sort by distance to set 1 intervals and, if present, by the tie-breaking
-    # data array.
-    if tie_arr is None:
-        order = np.lexsort([closest_ids[:, 1], closest_dists, closest_ids[:, 0]])
-    else:
-        order = np.lexsort(
-            [closest_ids[:, 1], tie_arr, closest_dists, closest_ids[:, 0]]
-        )
+    # Look up the tie-breaking values of the candidate set 2 intervals.
+    tie_vals = None if tie_arr is None else np.asarray(tie_arr)[closest_ids[:, 1]]
 
-    closest_ids = closest_ids[order, :2]
-
-    # For each set 1 interval, select up to k closest neighbours.
-    interval1_run_border_mask = closest_ids[:-1, 0] != closest_ids[1:, 0]
-    interval1_run_borders = np.where(np.r_[True, interval1_run_border_mask, True])[0]
-    interval1_run_starts = interval1_run_borders[:-1]
-    interval1_run_ends = interval1_run_borders[1:]
-    closest_ids = closest_ids[
-        arange_multi(
-            interval1_run_starts,
-            lengths=np.minimum(k, interval1_run_ends - interval1_run_starts),
+    n2 = len(starts2)
+    if k == 1 and tie_vals is None and closest_dists.dtype.kind == "i":
+        max_dist = int(closest_dists.max()) if closest_dists.shape[0] > 0 else 0
+        if (max_dist + 1) * (n2 + 1) < np.iinfo(np.int64).max:
+            return _closest_k1_fast(
+                np.asarray(closest_ids[:, 0]),
+                np.asarray(closest_ids[:, 1]),
+                closest_dists,
+                n,
+                n2,
+            )
+
+    if (
+        HAS_NUMBA
+        and closest_dists.dtype.kind == "i"
+        and (tie_vals is None or tie_vals.dtype.kind == "i")
+    ):
+        # Select the k nearest neighbors per set 1 interval directly,
+        # without a global sort of the candidate list.
+        if tie_vals is None:
+            tie_vals = np.zeros(closest_ids.shape[0], dtype=np.int64)
+        return _closest_topk_nb(
+            np.ascontiguousarray(closest_ids[:, 0], dtype=np.int64),
+            np.ascontiguousarray(closest_ids[:, 1], dtype=np.int64),
+            np.ascontiguousarray(closest_dists, dtype=np.int64),
+            np.ascontiguousarray(tie_vals, dtype=np.int64),
+            n,
+            int(k),
         )
-    ]
 
-    return closest_ids
+    # Group candidates by set 1 interval and select up to k closest
+    # neighbours per group, pre-filtering large groups with np.partition
+    # instead of sorting the whole candidate list.
+    return _closest_topk_np(
+        np.asarray(closest_ids[:, 0]),
+        np.asarray(closest_ids[:, 1]),
+        closest_dists,
+        tie_vals,
+        n,
+        k,
+    )
 
 
 def coverage_intervals_rle(starts, ends, weights=None):
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from bioframe.core import arrops
+
+
+def test_argnatsort_mixed_labels():
+    # Ensembl-style chromosome names mix purely numeric and alphabetic
+    # labels; the natural-sort keys must stay comparable across both.
+    assert np.array_equal(
+        arrops.argnatsort(np.array(["2", "10", "X", "1"])), [3, 0, 1, 2]
+    )
+    assert np.array_equal(
+        arrops.argnatsort(np.array(["chr10", "chr2", "chrX", "chr1"])), [3, 1, 0, 2]
+    )
+
+
+def test_overlap_intervals_tied_starts():
+    # Intervals sharing a start position must be paired regardless of the
+    # order in which the sort visits them.
+    starts1 = np.array([5, 5, 10])
+    ends1 = np.array([15, 8, 12])
+    starts2 = np.array([5, 11])
+    ends2 = np.array([7, 20])
+
+    expected = np.array([[0, 0], [0, 1], [1, 0], [2, 1]])
+
+    assert np.array_equal(
+        arrops.overlap_intervals(starts1, ends1, starts2, ends2, sort=True),
+        expected,
+    )
+    assert np.array_equal(
+        arrops._overlap_intervals_legacy(starts1, ends1, starts2, ends2, sort=True),
+        expected,
+    )
+
+
+def test_interval_index_matches_overlap_intervals():
+    rng = np.random.RandomState(1)
+    for _ in range(50):
+        n1, n2 = rng.randint(1, 20, 2)
+        starts1 = rng.randint(0, 30, n1)
+        ends1 = starts1 + rng.randint(1, 10, n1)
+        starts2 = rng.randint(0, 30, n2)
+        ends2 = starts2 + rng.randint(1, 10, n2)
+        index = arrops.IntervalIndex(starts2, ends2)
+        for closed in (False, True):
+            assert np.array_equal(
+                index.query(starts1, ends1, closed=closed, sort=True),
+                arrops.overlap_intervals(
+                    starts1, ends1, starts2, ends2, closed=closed, sort=True
+                ),
+            )
+
+
+def test_interval_index_rejects_float_coordinates():
+    with pytest.raises(ValueError):
+        arrops.IntervalIndex(np.array([1.6]), np.array([5.4]))
+    index = arrops.IntervalIndex(np.array([1]), np.array([5]))
+    with pytest.raises(ValueError):
+        index.query(np.array([5.1]), np.array([6.0]))
+
+
+def test_interval_index_empty():
+    index = arrops.IntervalIndex(np.array([], dtype=int), np.array([], dtype=int))
+    assert index.query(np.array([0]), np.array([10])).shape == (0, 2)
+    index = arrops.IntervalIndex(np.array([0]), np.array([10]))
+    assert index.query(np.array([], dtype=int), np.array([], dtype=int)).shape == (
+        0,
+        2,
+    )
+
+
+def test_overlap_intervals_legacy_dense_matches_numpy():
+    # Dense all-overlapping input whose candidate list exceeds the dispatch
+    # gate, so the sweep-line kernel is exercised when numba is available.
+    rng = np.random.RandomState(2)
+    n = 600
+    starts1 = rng.randint(0, 100, n)
+    ends1 = starts1 + rng.randint(400, 500, n)
+    starts2 = rng.randint(0, 100, n)
+    ends2 = starts2 + rng.randint(400, 500, n)
+
+    for closed in (False, True):
+        got = arrops._overlap_intervals_legacy(
+            starts1, ends1, starts2, ends2, closed=closed, sort=True
+        )
+        assert got.shape == (n * n, 2)
+        had_numba = arrops.HAS_NUMBA
+        arrops.HAS_NUMBA = False
+        try:
+            ref = arrops._overlap_intervals_legacy(
+                starts1, ends1, starts2, ends2, closed=closed, sort=True
+            )
+        finally:
+            arrops.HAS_NUMBA = had_numba
+        assert np.array_equal(got, ref)
+
+
+def test_overlap_intervals_legacy_matches_current():
+    rng = np.random.RandomState(0)
+    for _ in range(50):
+        n1, n2 = rng.randint(1, 20, 2)
+        starts1 = rng.randint(0, 30, n1)
+        ends1 = starts1 + rng.randint(1, 10, n1)
+        starts2 = rng.randint(0, 30, n2)
+        ends2 = starts2 + rng.randint(1, 10, n2)
+        for closed in (False, True):
+            assert np.array_equal(
+                arrops.overlap_intervals(
+                    starts1, ends1, starts2, ends2, closed=closed, sort=True
+                ),
+                arrops._overlap_intervals_legacy(
+                    starts1, ends1, starts2, ends2, closed=closed, sort=True
+                ),
+            )